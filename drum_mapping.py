@@ -1,87 +1,97 @@
 #!/usr/bin/python3
 # drum_mapping.py
 
+from types import MappingProxyType
+
+DRUM_NAME_TO_NUMBER = MappingProxyType({
+    # TODO "pretty-fy the key-value spacing
+    "laser" : 27,
+    "whip": 28,
+    "scratch_push": 29,
+    "scratch_pull": 30,
+    "sticks": 31,
+    "metronome_click": 32,
+    "metronome_bell": 33,
+    "bass_drum": 34,
+    "kick_drum": 35,  # COMMON
+    "bass_drum_1": 36,
+    "snare_cross_stick": 37,  # COMMON
+    "snare_drum_1": 38,  # COMMON
+    "hand_clap": 39,  # COMMON
+    "snare_drum_2": 40,
+    "tom_1": 41,  # COMMON
+    "cymbal_hi_hat_closed": 42,  # COMMON
+    "tom_2": 43,  # COMMON
+    "cymbal_hi_hat_pedal": 44,  # COMMON
+    "tom_3": 45,  # COMMON
+    "cymbal_hi_hat_open": 46,  # COMMON
+    "tom_4": 47,  # COMMON
+    "tom_5": 48,  # COMMON
+    "cymbal_crash_1": 49,  # COMMON
+    "tom_6": 50,  # COMMON
+    "cymbal_ride_1": 51,  # COMMON
+    "cymbal_china": 52,  # COMMON
+    "cymbal_ride_bell": 53,  # COMMON
+    "tambourine": 54,  # COMMON
+    "cymbal_splash": 55,  # COMMON
+    "cowbell": 56,  # COMMON
+    "cymbal_crash_2": 57,  # COMMON
+    "vibraslap": 58,
+    "cymbal_ride_2": 59,
+    "high_bongo": 60,
+    "low_bongo": 61,
+    "conga_dead_stroke": 62,
+    "conga": 63,
+    "high_timbale": 64,
+    "low_timbale": 65,
+    "high_agogo": 66,
+    "low_agogo": 67,
+    "cabasa": 68,
+    "maracas": 69,
+    "whistle_short": 70,
+    "whistle_long": 71,
+    "guiro_short": 72,
+    "guiro_long": 73,
+    "claves": 74,
+    "high_woodblock": 75,
+    "low_woodblock": 76,
+    "cuica_high": 77,
+    "cuica_low": 78,
+    "triangle_mute": 79,  # COMMON
+    "triangle_open": 80,  # COMMON
+    "shaker": 81,
+    "sleigh_bell": 82,
+    "bell_tree": 83,
+    "castanets": 84,
+    "surdu_dead_stroke": 85,
+    "surdu": 86,
+    "snare_drum_rod": 87,
+    "ocean_drum": 88,
+    "snare_drum_brush": 89,
+})
+
+# Bound lookup: get_drum("snare_drum_1", 32)
+get_drum = DRUM_NAME_TO_NUMBER.get
+
 class DrumMapping:
     """
     @brief      Helpful encapsulated mapping for drum name to midi drum pitch
     @detail     While using MidiWriter.addNote()
-                contains class variable NAME_TO_NUMBER (dict)
+                contains class variable NAME_TO_NUMBER (read-only mapping), which is
+                the module-level DRUM_NAME_TO_NUMBER; get_drum is its bound .get
     
     @usage
     ```
     from midi_writer import MidiWriter
     myMidi = MidiWriter()
     snare_pitch = DrumMapping.NAME_TO_NUMBER.get("snare_drum_1", 32)
+    # or, without the class attribute lookup:
+    snare_pitch = get_drum("snare_drum_1", 32)
     myMidi.addNote(track=0, channel=9, start=0, duration=480, pitch=snare_pitch, velocity=120)
     ```
     """
 
-    NAME_TO_NUMBER = {
-        # TODO "pretty-fy the key-value spacing
-        "laser" : 27,
-        "whip": 28,
-        "scratch_push": 29,
-        "scratch_pull": 30,
-        "sticks": 31,
-        "metronome_click": 32,
-        "metronome_bell": 33,
-        "bass_drum": 34,
-        "kick_drum": 35,  # COMMON
-        "bass_drum_1": 36,
-        "snare_cross_stick": 37,  # COMMON
-        "snare_drum_1": 38,  # COMMON
-        "hand_clap": 39,  # COMMON
-        "snare_drum_2": 40,
-        "tom_1": 41,  # COMMON
-        "cymbal_hi_hat_closed": 42,  # COMMON
-        "tom_2": 43,  # COMMON
-        "cymbal_hi_hat_pedal": 44,  # COMMON
-        "tom_3": 45,  # COMMON
-        "cymbal_hi_hat_open": 46,  # COMMON
-        "tom_4": 47,  # COMMON
-        "tom_5": 48,  # COMMON
-        "cymbal_crash_1": 49,  # COMMON
-        "tom_6": 50,  # COMMON
-        "cymbal_ride_1": 51,  # COMMON
-        "cymbal_china": 52,  # COMMON
-        "cymbal_ride_bell": 53,  # COMMON
-        "tambourine": 54,  # COMMON
-        "cymbal_splash": 55,  # COMMON
-        "cowbell": 56,  # COMMON
-        "cymbal_crash_2": 57,  # COMMON
-        "vibraslap": 58,
-        "cymbal_ride_2": 59,
-        "high_bongo": 60,
-        "low_bongo": 61,
-        "conga_dead_stroke": 62,
-        "conga": 63,
-        "high_timbale": 64,
-        "low_timbale": 65,
-        "high_agogo": 66,
-        "low_agogo": 67,
-        "cabasa": 68,
-        "maracas": 69,
-        "whistle_short": 70,
-        "whistle_long": 71,
-        "guiro_short": 72,
-        "guiro_long": 73,
-        "claves": 74,
-        "high_woodblock": 75,
-        "low_woodblock": 76,
-        "cuica_high": 77,
-        "cuica_low": 78,
-        "triangle_mute": 79,  # COMMON
-        "triangle_open": 80,  # COMMON
-        "shaker": 81,
-        "sleigh_bell": 82,
-        "bell_tree": 83,
-        "castanets": 84,
-        "surdu_dead_stroke": 85,
-        "surdu": 86,
-        "snare_drum_rod": 87,
-        "ocean_drum": 88,
-        "snare_drum_brush": 89,
-    }
+    NAME_TO_NUMBER = DRUM_NAME_TO_NUMBER
 
 
 if __name__ == "__main__":
@@ -0,0 +1,215 @@
+#!/usr/bin/python3
+"""
+Module:   midi_fuzz.py
+Detail:   Randomized output check for MidiWriter.
+
+This module builds random scores, writes each one with MidiWriter and with a
+plain reference encoder, and checks that the bytes are identical. Every score
+is checked with and without running status, through _write_rows() and through
+the row serializers. Without Numba, the row serializers run as plain Python.
+
+@usage
+    python3 midi_fuzz.py [number of scores]
+"""
+
+import random
+import sys
+
+import midi_writer
+from midi_writer import MidiWriter
+
+class ReferenceWriter:
+    """
+    @brief  Straightforward MIDI encoder that MidiWriter's output is checked against.
+
+    Records the same calls as MidiWriter and encodes them the simple way: one
+    event list per track, sorted by tick, then meta events, note offs and other
+    channel events, then insertion order.
+    """
+
+    def __init__(self):
+        """
+        @brief  Constructor.
+        """
+        self.tracks = []  # Per track: list of (tick, rank, seq, event bytes).
+        self.seq = 0
+
+    def _add(self, track, tick, event_bytes):
+        """
+        @brief  Record one event, auto-adding tracks like MidiWriter._get_track().
+        """
+        while track >= len(self.tracks):
+            self.tracks.append([])
+        if event_bytes[0] == 0xFF:
+            rank = 0
+        elif event_bytes[0] & 0xF0 == 0x80:
+            rank = 1
+        else:
+            rank = 2
+        self.tracks[track].append((tick, rank, self.seq, event_bytes))
+        self.seq += 1
+
+    def setChannel(self, channel, program):
+        """
+        @brief  Same event as MidiWriter.setChannel().
+        """
+        self._add(0, 0, bytes([0xC0 | channel, program]))
+
+    def addBPM(self, track, start, bpm):
+        """
+        @brief  Same event as MidiWriter.addBPM().
+        """
+        self._add(track, start, b"\xFF\x51\x03" + int(60000000 // bpm).to_bytes(3, "big"))
+
+    def addTimeSignature(self, track, start, numerator, denominator):
+        """
+        @brief  Same event as MidiWriter.addTimeSignature().
+        """
+        self._add(track, start, bytes([0xFF, 0x58, 0x04, numerator, denominator.bit_length() - 1, 24, 8]))
+
+    def addNote(self, track, channel, start, duration, pitch, velocity):
+        """
+        @brief  Same event as MidiWriter.addNote().
+        """
+        self._add(track, start, bytes([0x90 | channel, pitch, velocity]))
+        self._add(track, start + duration, bytes([0x80 | channel, pitch, 0]))
+
+    @staticmethod
+    def var_len(value):
+        """
+        @brief  Encode a MIDI variable-length quantity, 7 bits at a time.
+        """
+        out = [value & 0x7F]
+        value >>= 7
+        while value:
+            out.append(0x80 | (value & 0x7F))
+            value >>= 7
+        return bytes(reversed(out))
+
+    def toBytes(self, running_status):
+        """
+        @brief  Encode the recorded events as a complete MIDI file.
+        """
+        num_tracks = len(self.tracks)
+        out = bytearray(b"MThd\x00\x00\x00\x06")
+        out += (1 if num_tracks > 1 else 0).to_bytes(2, "big")
+        out += num_tracks.to_bytes(2, "big") + (480).to_bytes(2, "big")
+        for events in self.tracks:
+            body = bytearray()
+            prev_tick = 0
+            prev_status = 0
+            for tick, _, _, event_bytes in sorted(events):
+                body += self.var_len(tick - prev_tick)
+                prev_tick = tick
+                if event_bytes[0] == 0xFF:
+                    # Meta events cancel running status.
+                    prev_status = 0
+                    body += event_bytes
+                elif running_status and event_bytes[0] == prev_status:
+                    body += event_bytes[1:]
+                else:
+                    prev_status = event_bytes[0] if running_status else 0
+                    body += event_bytes
+            body += b"\x00\xFF\x2F\x00"
+            out += b"MTrk" + len(body).to_bytes(4, "big") + body
+        return bytes(out)
+
+def build_score(seed, writers):
+    """
+    @brief  Make the same random calls on every writer.
+
+    @param  seed (int): Seed of the random score.
+    @param  writers (tuple): (MidiWriter, ReferenceWriter).
+    """
+    rng = random.Random(seed)
+    midi, ref = writers
+    for _ in range(rng.randrange(0, 400)):
+        kind = rng.random()
+        track = rng.randrange(3)
+        if kind < 0.05:
+            start, bpm = rng.randrange(0, 20000), rng.choice([60, 90, 120, 133])
+            midi.addBPM(track=track, start=start, bpm=bpm)
+            ref.addBPM(track, start, bpm)
+        elif kind < 0.08:
+            channel, program = rng.randrange(16), rng.randrange(128)
+            midi.setChannel(channel=channel, program=program)
+            ref.setChannel(channel, program)
+        elif kind < 0.1:
+            start, denominator = rng.randrange(0, 20000), rng.choice([2, 4, 8])
+            midi.addTimeSignature(track=track, start=start, numerator=3, denominator=denominator)
+            ref.addTimeSignature(track, start, 3, denominator)
+        elif kind < 0.15:
+            # A batch of notes with one velocity, sometimes one duration.
+            count = rng.randrange(0, 30)
+            channel, velocity = rng.randrange(16), rng.randrange(128)
+            starts = [rng.randrange(0, 9000) for _ in range(count)]
+            pitches = [rng.randrange(128) for _ in range(count)]
+            if rng.random() < 0.5:
+                durations = [rng.randrange(1, 700) for _ in range(count)]
+                midi.addNotes(starts, durations, pitches, velocity, track=track, channel=channel)
+            else:
+                midi.addNotes(starts, 120, pitches, velocity, track=track, channel=channel)
+                durations = [120] * count
+            for start, duration, pitch in zip(starts, durations, pitches):
+                ref.addNote(track, channel, start, duration, pitch, velocity)
+        else:
+            # Mostly short gaps, sometimes a delta-time of several bytes.
+            start = rng.randrange(0, 2 ** 27) if kind < 0.16 else rng.randrange(0, 20000)
+            note = (track, rng.randrange(16), start, rng.randrange(1, 2000), rng.randrange(128), rng.randrange(128))
+            midi.addNote(*note)
+            ref.addNote(*note)
+
+def check(num_scores, jit):
+    """
+    @brief  Compare MidiWriter against the reference encoder on random scores.
+
+    @param  num_scores (int): Number of random scores.
+    @param  jit (bool): Serialize every track with the row serializers.
+    @return (int): Number of mismatching files.
+    """
+    threshold = midi_writer._JIT_THRESHOLD
+    midi_writer._JIT_THRESHOLD = 0 if jit else 1 << 62
+    serializers = dict(midi_writer._row_serializers)
+    if jit:
+        for running_status in (True, False):
+            if midi_writer._get_row_serializer(running_status) is None:
+                # No Numba: run the same serializer uncompiled.
+                midi_writer._row_serializers[running_status] = midi_writer._make_row_serializer(running_status)
+    try:
+        failures = 0
+        for seed in range(num_scores):
+            writers = (MidiWriter(), ReferenceWriter())
+            build_score(seed, writers)
+            for running_status in (True, False):
+                writers[0].running_status = running_status
+                if bytes(writers[0].toBytes()) != writers[1].toBytes(running_status):
+                    print("[E] Mismatch: seed={}, running_status={}, jit={}".format(seed, running_status, jit))
+                    failures += 1
+        return failures
+    finally:
+        midi_writer._JIT_THRESHOLD = threshold
+        midi_writer._row_serializers.clear()
+        midi_writer._row_serializers.update(serializers)
+
+def main():
+    """
+    @brief  Runs the randomized check on both serializer paths.
+    @return None
+    """
+    num_scores = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print("*" * 80)
+    failures = check(num_scores, jit=False)
+    print("Checked {} scores with the Python serializer.".format(num_scores))
+    failures += check(num_scores, jit=True)
+    if midi_writer._get_row_serializer(True) is None:
+        print("Checked {} scores with the row serializers (Numba is not installed: run as plain Python).".format(num_scores))
+    else:
+        print("Checked {} scores with the Numba row serializers.".format(num_scores))
+    print("*" * 80)
+    if failures:
+        print("{} mismatching files!".format(failures))
+        sys.exit(1)
+    print("Successfully ran all tests!")
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ This module demonstrates example usage of the MidiWriter library by generating
 various MIDI files including simple scales, chords, multiple tracks, and drum patterns.
 """
 
+from types import MappingProxyType
+
 from midi_writer import MidiWriter
 
 class MidiTest:
@@ -24,7 +26,7 @@ class MidiTest:
     DEFAULT_DRUM_PITCH: int = 32 # Default pitch for metronome click
 
     # Drum Kit Definition (MIDI note numbers)
-    DRUMS = {
+    DRUMS = MappingProxyType({
         "kick_drum": 35,
         "snare_drum_rim": 37,
         "snare_drum": 38,
@@ -43,20 +45,18 @@ class MidiTest:
         "tom5": 50,
         "tambourine": 54,
         "cowbell": 56  # Need more cowbell!
-    }
+    })
     
     @staticmethod
-    def test_twinkle_star() -> None:
+    def test_twinkle_star(myMidi: MidiWriter) -> tuple:
         """
         @brief  Creates a simple 'Twinkle Little Star' MIDI file.
-        @return None
+        @param  myMidi (MidiWriter): Empty MIDI object to fill.
+        @return (tuple): (output filename, MIDI file bytes)
         """
         # Create a simpler alias for TICKS_PER_QUARTER
         TPQ = MidiTest.TICKS_PER_QUARTER
         
-        # Create MIDI object
-        myMidi = MidiWriter()
-
         # Create tempo event
         myMidi.addBPM(start=0, bpm=MidiTest.DEFAULT_BPM)
         
@@ -67,36 +67,37 @@ class MidiTest:
         notes: str = "CCGGAAG_FFEEDDC_GGFFEED_GGFFEED_CCGGAAG_FFEEDDC_"
         letter_to_pitch = {"C": 60, "D": 62, "E": 64, "F": 65, "G": 67, "A": 69, "B": 71}
         
-        # Loop over song data and create notes
-        for beat, note in enumerate(notes):
-            note_pitch = letter_to_pitch.get(note, None)
-            if note_pitch is None:
-                continue  # Skip if not a valid note
-            myMidi.addNote(
-                pitch=note_pitch,
-                start=beat * TPQ,
-                duration=TPQ
-            )
-            if beat == 8:
-                myMidi.addBPM(start=beat * TPQ, bpm=80)
-            if beat == 16:
-                myMidi.addBPM(start=beat * TPQ, bpm=180)
+        # Translation table from ASCII code to pitch; 255 marks a rest / invalid note
+        NO_PITCH: int = 255
+        pitch_table = bytearray([NO_PITCH]) * 256
+        for letter, pitch in letter_to_pitch.items():
+            pitch_table[ord(letter)] = pitch
+        
+        # Convert song data to pitches in one pass and create notes
+        pitches: bytes = notes.encode("ascii").translate(pitch_table)
+        beats = [beat for beat, pitch in enumerate(pitches) if pitch != NO_PITCH]
+        myMidi.addNotes(
+            starts=[beat * TPQ for beat in beats],
+            durations=TPQ,
+            pitches=[pitches[beat] for beat in beats]
+        )
+        
+        # Create tempo change events
+        myMidi.addBPM(start=8 * TPQ, bpm=80)
+        myMidi.addBPM(start=16 * TPQ, bpm=180)
         
-        # Write out MIDI object
+        # Serialize MIDI object (written to disk in MidiTest.main)
         output_filename: str = "test_twinkle_star.mid"
-        myMidi.save(output_filename)
-        print(f"Successfully created {output_filename}")
+        return output_filename, myMidi.toBytes()
 
     @staticmethod
-    def test_chords() -> None:
+    def test_chords(myMidi: MidiWriter) -> tuple:
         """
         @brief  Tests multiple notes (chords) occurring simultaneously.
-        @return None
+        @param  myMidi (MidiWriter): Empty MIDI object to fill.
+        @return (tuple): (output filename, MIDI file bytes)
         """
         
-        # Create MIDI object
-        myMidi = MidiWriter()
-
         # Create tempo event
         myMidi.addBPM(start=0, bpm=MidiTest.DEFAULT_BPM)
 
@@ -128,22 +129,19 @@ class MidiTest:
                 pitch=note.get("pitch", 60)
             )
         
-        # Write out MIDI object
+        # Serialize MIDI object (written to disk in MidiTest.main)
         output_filename: str = "test_chords.mid"
-        myMidi.save(output_filename)
-        print(f"Successfully created {output_filename}")
+        return output_filename, myMidi.toBytes()
 
     @staticmethod    
-    def test_multiple_tracks() -> None:
+    def test_multiple_tracks(myMidi: MidiWriter) -> tuple:
         """
         @brief  Tests creating multiple tracks with a single note on each.
         @detail Good practice to alternate channels between tracks to keep each track separate
                 in MuseScore. MuseScore tends to combine staves that share the same program index.
-        @return None
+        @param  myMidi (MidiWriter): Empty MIDI object to fill.
+        @return (tuple): (output filename, MIDI file bytes)
         """
-        # Create MIDI object
-        myMidi = MidiWriter()
-
         # Create tempo event
         myMidi.addBPM(start=0, bpm=MidiTest.DEFAULT_BPM)
         
@@ -160,88 +158,86 @@ class MidiTest:
         myMidi.addNote(track=2, channel=0, start=2 * TPQ, duration=1 * TPQ, pitch=64)
         myMidi.addNote(track=3, channel=1, start=3 * TPQ, duration=1 * TPQ, pitch=65)
         
-        # Write out MIDI object
+        # Serialize MIDI object (written to disk in MidiTest.main)
         output_filename: str = "test_multiple_tracks.mid"
-        myMidi.save(output_filename)
-        print(f"Successfully created {output_filename}")
+        return output_filename, myMidi.toBytes()
 
     @staticmethod
-    def create_drum_midi(filename: str, bpm: int, patterns: dict) -> None:
+    def create_drum_midi(myMidi: MidiWriter, filename: str, bpm: int, patterns: dict) -> tuple:
         """
         @brief  Creates a MIDI file with the given drum patterns.
+        @param  myMidi (MidiWriter): Empty MIDI object to fill.
         @param  filename (str): Output filename.
         @param  bpm (int): Beats per minute.
         @param  patterns (dict): Mapping from pattern string to drum pitch.
-        @return None
+        @return (tuple): (output filename, MIDI file bytes)
         """
         
-        # Create MIDI object
-        myMidi = MidiWriter()
-
         # Create tempo event
         myMidi.addBPM(start=0, bpm=bpm)
         
         # Create a simpler alias for 16th note tick value
         TICK_PER_16TH: int = MidiTest.TICKS_PER_QUARTER / 4
         
-        # Loop over drum patterns and create drum notes
+        # Loop over drum patterns and create drum notes, one batch per drum
         for pattern, drum_pitch in patterns.items():
-            i = 0
-            for c in pattern:
-                if c == "x":
-                    myMidi.addNote(
-                        track=0, 
-                        channel=MidiTest.DRUM_CHANNEL, 
-                        start=int(i * TICK_PER_16TH), 
-                        duration=int(TICK_PER_16TH),
-                        pitch=drum_pitch, 
-                        velocity=MidiTest.DEFAULT_VELOCITY
-                    )
-                # Do not increment on "|" separators
-                i += 1 if c != "|" else 0
+            # Do not count "|" separators as steps
+            steps = pattern.replace("|", "")
+            starts = [i * TICK_PER_16TH for i, c in enumerate(steps) if c == "x"]
+            myMidi.addNotes(
+                starts=starts,
+                durations=TICK_PER_16TH,
+                pitches=drum_pitch,
+                velocities=MidiTest.DEFAULT_VELOCITY,
+                track=0,
+                channel=MidiTest.DRUM_CHANNEL
+            )
         
-        # Write out MIDI object
-        myMidi.save(filename)
-        print(f"Successfully created {filename}")
+        # Serialize MIDI object (written to disk in MidiTest.main)
+        return filename, myMidi.toBytes()
 
     @staticmethod
-    def test_amen_drums() -> None:
+    def test_amen_drums(myMidi: MidiWriter) -> tuple:
         """
         @brief  Creates an Amen break drum pattern MIDI file.
-        @return None
+        @param  myMidi (MidiWriter): Empty MIDI object to fill.
+        @return (tuple): (output filename, MIDI file bytes)
         """
+        drum = MidiTest.DRUMS.get
         amen_patterns = {
-            "................|................|................|..........x.....|": MidiTest.DRUMS.get("cymbal_crash1", MidiTest.DEFAULT_DRUM_PITCH),
-            "x.x.x.x.x.x.x.x.|x.x.x.x.x.x.x.x.|x.x.x.x.x.x.x.x.|x.x.x.x.x...x.x.|": MidiTest.DRUMS.get("cymbal_ride", MidiTest.DEFAULT_DRUM_PITCH),
-            "....x.......x...|....x.......x...|....x.........x.|....x.........x.|": MidiTest.DRUMS.get("snare_drum", MidiTest.DEFAULT_DRUM_PITCH),
-            ".......x.x.....x|.......x.x.....x|.......x.x......|.x.....x.x......|": MidiTest.DRUMS.get("snare_drum_rim", MidiTest.DEFAULT_DRUM_PITCH),
-            "x.........xx....|x.........xx....|x.x.......x.....|..xx......x.....|": MidiTest.DRUMS.get("kick_drum", MidiTest.DEFAULT_DRUM_PITCH)
+            "................|................|................|..........x.....|": drum("cymbal_crash1", MidiTest.DEFAULT_DRUM_PITCH),
+            "x.x.x.x.x.x.x.x.|x.x.x.x.x.x.x.x.|x.x.x.x.x.x.x.x.|x.x.x.x.x...x.x.|": drum("cymbal_ride", MidiTest.DEFAULT_DRUM_PITCH),
+            "....x.......x...|....x.......x...|....x.........x.|....x.........x.|": drum("snare_drum", MidiTest.DEFAULT_DRUM_PITCH),
+            ".......x.x.....x|.......x.x.....x|.......x.x......|.x.....x.x......|": drum("snare_drum_rim", MidiTest.DEFAULT_DRUM_PITCH),
+            "x.........xx....|x.........xx....|x.x.......x.....|..xx......x.....|": drum("kick_drum", MidiTest.DEFAULT_DRUM_PITCH)
         }
         SONG_BPM: int = 170
-        MidiTest.create_drum_midi("test_drum_amen.mid", SONG_BPM, amen_patterns)
+        return MidiTest.create_drum_midi(myMidi, "test_drum_amen.mid", SONG_BPM, amen_patterns)
 
     @staticmethod
-    def test_disco_drums() -> None:
+    def test_disco_drums(myMidi: MidiWriter) -> tuple:
         """
         @brief  Demonstrates a simple disco drum beat in a MIDI file.
-        @return None
+        @param  myMidi (MidiWriter): Empty MIDI object to fill.
+        @return (tuple): (output filename, MIDI file bytes)
         """
+        drum = MidiTest.DRUMS.get
         disco_patterns = {
-            "|x...............|................|................|................|x...............|": MidiTest.DRUMS.get("cymbal_crash1", MidiTest.DEFAULT_DRUM_PITCH),
-            "|................|................|x...x...x...x...|................|................|": MidiTest.DRUMS.get("cymbal_ride", MidiTest.DEFAULT_DRUM_PITCH),
-            "|................|................|..x...x...x...x.|................|................|": MidiTest.DRUMS.get("cymbal_ride_bell", MidiTest.DEFAULT_DRUM_PITCH),
-            "|....xx.xxx.xxx.x|xx.xxx.xxx.xxx.x|................|................|................|": MidiTest.DRUMS.get("cymbal_hihat_closed", MidiTest.DEFAULT_DRUM_PITCH),
-            "|......x...x...x.|..x...x...x...x.|................|................|................|": MidiTest.DRUMS.get("cymbal_hihat_open", MidiTest.DEFAULT_DRUM_PITCH),
-            "|................|................|................|xxx.............|................|": MidiTest.DRUMS.get("tom5", MidiTest.DEFAULT_DRUM_PITCH),
-            "|................|................|................|...xxx..........|................|": MidiTest.DRUMS.get("tom4", MidiTest.DEFAULT_DRUM_PITCH),
-            "|................|................|................|......xxx.......|................|": MidiTest.DRUMS.get("tom3", MidiTest.DEFAULT_DRUM_PITCH),
-            "|................|................|................|.........xxx....|................|": MidiTest.DRUMS.get("tom2", MidiTest.DEFAULT_DRUM_PITCH),
-            "|x...x...x...x...|x...x...x...x...|x...x...x...x...|x...x...x...x...|x...............|": MidiTest.DRUMS.get("cowbell", MidiTest.DEFAULT_DRUM_PITCH),
-            "|....x.......x..x|....x.......xxxx|...x..x....x..x.|............xxxx|................|": MidiTest.DRUMS.get("snare_drum", MidiTest.DEFAULT_DRUM_PITCH),
-            "|x.....x...x..x..|x.....x...x..x..|x.....x...x..x..|x...x...x...x...|x...............|": MidiTest.DRUMS.get("kick_drum", MidiTest.DEFAULT_DRUM_PITCH)
+            "|x...............|................|................|................|x...............|": drum("cymbal_crash1", MidiTest.DEFAULT_DRUM_PITCH),
+            "|................|................|x...x...x...x...|................|................|": drum("cymbal_ride", MidiTest.DEFAULT_DRUM_PITCH),
+            "|................|................|..x...x...x...x.|................|................|": drum("cymbal_ride_bell", MidiTest.DEFAULT_DRUM_PITCH),
+            "|....xx.xxx.xxx.x|xx.xxx.xxx.xxx.x|................|................|................|": drum("cymbal_hihat_closed", MidiTest.DEFAULT_DRUM_PITCH),
+            "|......x...x...x.|..x...x...x...x.|................|................|................|": drum("cymbal_hihat_open", MidiTest.DEFAULT_DRUM_PITCH),
+            "|................|................|................|xxx.............|................|": drum("tom5", MidiTest.DEFAULT_DRUM_PITCH),
+            "|................|................|................|...xxx..........|................|": drum("tom4", MidiTest.DEFAULT_DRUM_PITCH),
+            "|................|................|................|......xxx.......|................|": drum("tom3", MidiTest.DEFAULT_DRUM_PITCH),
+            "|................|................|................|.........xxx....|................|": drum("tom2", MidiTest.DEFAULT_DRUM_PITCH),
+            "|x...x...x...x...|x...x...x...x...|x...x...x...x...|x...x...x...x...|x...............|": drum("cowbell", MidiTest.DEFAULT_DRUM_PITCH),
+            "|....x.......x..x|....x.......xxxx|...x..x....x..x.|............xxxx|................|": drum("snare_drum", MidiTest.DEFAULT_DRUM_PITCH),
+            "|x.....x...x..x..|x.....x...x..x..|x.....x...x..x..|x...x...x...x...|x...............|": drum("kick_drum", MidiTest.DEFAULT_DRUM_PITCH)
         }
         SONG_BPM: int = 125
-        MidiTest.create_drum_midi("test_drums_disco.mid", SONG_BPM, disco_patterns)
+        return MidiTest.create_drum_midi(myMidi, "test_drums_disco.mid", SONG_BPM, disco_patterns)
     
     @staticmethod
     def main() -> None:
@@ -251,11 +247,23 @@ class MidiTest:
         """
         print("*" * 80)
         
-        MidiTest.test_twinkle_star()
-        MidiTest.test_chords()
-        MidiTest.test_multiple_tracks()
-        MidiTest.test_amen_drums()
-        MidiTest.test_disco_drums()
+        # Build every MIDI file in memory with one reused MIDI object,
+        # then write them all in one batch
+        tests = [
+            MidiTest.test_twinkle_star,
+            MidiTest.test_chords,
+            MidiTest.test_multiple_tracks,
+            MidiTest.test_amen_drums,
+            MidiTest.test_disco_drums,
+        ]
+        myMidi = MidiWriter()
+        files = []
+        for test in tests:
+            myMidi.reset()
+            files.append(test(myMidi))
+        MidiWriter.saveBatch(files)
+        for output_filename, _ in files:
+            print(f"Successfully created {output_filename}")
         
         print("*" * 80)
         print("Successfully ran all tests!")
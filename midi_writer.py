@@ -9,7 +9,287 @@ Date:     Feb 3, 2025
 This module contains a MidiWriter class with methods to create a MIDI file.
 """
 
+import mmap
+import operator
+import os
+import stat
 import struct
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+
+# Precompiled big-endian packers for chunk lengths and the header fields.
+_U32BE = struct.Struct(">I")
+_HEADER_DATA = struct.Struct(">hhh")
+
+@lru_cache(maxsize=256)
+def _tempo_meta(bpm):
+    """
+    @brief  Build the tempo meta event for a BPM value (cached per BPM).
+    
+    @param  bpm (int): Beats per minute (> 0).
+    @return (bytes): The meta event FF 51 03 <tempo>, where tempo is the
+                     3-byte big-endian number of microseconds per quarter note.
+    """
+    # Formula: 60,000,000 / BPM.
+    tempo = int(60000000 // bpm)
+    return b"\xFF\x51\x03" + tempo.to_bytes(3, byteorder="big")
+
+# Sort key and message of a Track.rows entry.
+_row_key = operator.itemgetter(0)
+_row_message = operator.itemgetter(1)
+
+def _sort_key(tick, status):
+    """
+    @brief  Sort key of a channel event (see MidiWriter.Track.sort_events()).
+    
+    @param  tick (int): Absolute tick time of the event.
+    @param  status (int): Status byte of the event.
+    @return (int): The tick, with one low bit that places note offs ahead of
+                   other events sharing that tick, so a re-struck pitch is not
+                   cut off by its predecessor's note off.
+    """
+    return (tick << 1) | ((status & 0xF0) != 0x80)
+
+# Below this many files, saveBatch() writes sequentially: starting threads
+# costs more than it saves for a handful of writes.
+_BATCH_THRESHOLD = 4
+
+# Thread pool shared by every saveBatch() call, created on first use.
+_write_pool = None
+
+def _get_write_pool():
+    """
+    @brief  Return the shared write pool, creating it on first use.
+    """
+    global _write_pool
+    if _write_pool is None:
+        _write_pool = ThreadPoolExecutor(thread_name_prefix="midi_writer")
+    return _write_pool
+
+# Files at least this large are written through mmap by MidiWriter.save();
+# below it, setting up the mapping costs more than the copy it avoids.
+_MMAP_THRESHOLD = 1 << 20
+
+def _write_chunks_mmap(filename, chunks, total):
+    """
+    @brief  Write a list of buffers back to back into a memory-mapped file.
+    
+    @param  filename (str): Path of the file to create or overwrite.
+    @param  chunks (list): The buffers making up the file, in order.
+    @param  total (int): Sum of the buffer lengths (> 0).
+    
+    Targets that cannot be mapped (/dev/null, a FIFO, a terminal) and
+    filesystems that refuse the mapping get plain sequential writes instead.
+    """
+    flags = os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(filename, flags, 0o666)
+    try:
+        mm = None
+        if stat.S_ISREG(os.fstat(fd).st_mode):
+            try:
+                if hasattr(os, "posix_fallocate"):
+                    # Allocate the blocks now: a full disk then fails here,
+                    # not as SIGBUS while copying into a sparse mapping.
+                    os.posix_fallocate(fd, 0, total)
+                os.ftruncate(fd, total)
+                mm = mmap.mmap(fd, total)
+            except (OSError, ValueError):
+                mm = None
+        if mm is None:
+            # Nothing was written yet, so the file position is still 0.
+            for chunk in chunks:
+                view = memoryview(chunk)
+                while view:
+                    view = view[os.write(fd, view):]
+            return
+        with mm:
+            offset = 0
+            for chunk in chunks:
+                mm[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+    finally:
+        os.close(fd)
+
+def _write_file(filename, data):
+    """
+    @brief  Write a complete buffer to a file with unbuffered os-level writes.
+    
+    @param  filename (str): Path of the file to create or overwrite.
+    @param  data (bytes-like): The complete file contents.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(filename, flags, 0o666)
+    try:
+        if hasattr(os, "posix_fallocate") and len(data) > 0:
+            try:
+                # Reserve the file's extents up front (not supported everywhere).
+                os.posix_fallocate(fd, 0, len(data))
+            except OSError:
+                pass
+        view = memoryview(data)
+        while view:
+            # os.write may write fewer bytes than requested.
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def _pack_var_len(value):
+    """
+    @brief  Encode a delta-time as a MIDI variable-length quantity, without loops.
+    
+    @param  value (int): The value to encode (0 to 0x0FFFFFFF).
+    @return (tuple): (packed, n_bytes): the n_bytes-byte encoding, big-endian, in
+                     the low bytes of the integer 'packed'.
+    
+    Spreads the four 7-bit chunks over the four bytes of one integer, sets the
+    continuation bit on all but the last byte, then keeps the low n_bytes bytes.
+    Shared by encode_var_len(), _write_rows() and the row serializer, which
+    Numba compiles with this function inlined.
+    """
+    n_bytes = 1 + (value >= 0x80) + (value >= 0x4000) + (value >= 0x200000)
+    packed = (
+        ((value << 3) & 0x7F000000) | ((value << 2) & 0x7F0000) |
+        ((value << 1) & 0x7F00) | (value & 0x7F) | 0x80808000
+    ) & ((1 << (8 * n_bytes)) - 1)
+    return packed, n_bytes
+
+def _write_rows(out, rows, prev_tick, prev_status, running_status):
+    """
+    @brief  Append sorted channel event rows to a track body.
+    
+    @param  out (bytearray): The track body written so far.
+    @param  rows (list): (sort key, message) pairs, see MidiWriter.Track.
+    @param  prev_tick (int): Tick of the last event already in 'out'.
+    @param  prev_status (int): Status byte in effect (0 for none).
+    @param  running_status (bool): Omit status bytes that repeat the previous one.
+    @return (tuple): (tick of the last written event, status byte in effect).
+    """
+    for key, message in rows:
+        delta = (key >> 1) - prev_tick
+        prev_tick += delta
+        status = message >> 16
+        if status != prev_status:
+            size = 3
+            if running_status:
+                prev_status = status
+        else:
+            message &= 0xFFFF
+            size = 2
+        if status & 0xE0 == 0xC0:
+            # Program change / channel pressure carry a single data byte.
+            message >>= 8
+            size -= 1
+        if delta < 0x80:
+            # Most events: a 1-byte delta-time, written with the message in one go.
+            out += (delta << (8 * size) | message).to_bytes(size + 1, "big")
+            continue
+        if delta > 0x0FFFFFFF:
+            MidiWriter._raise_delta_error(delta)
+        packed, n_bytes = _pack_var_len(delta)
+        out += (packed << (8 * size) | message).to_bytes(n_bytes + size, "big")
+    return prev_tick, prev_status
+
+# Tracks with at least this many channel events are serialized by a Numba
+# kernel when Numba is installed (see _get_row_serializer()). Smaller tracks
+# are written by _write_rows(), which needs neither the import of Numba nor
+# the conversion of the rows to typed columns.
+_JIT_THRESHOLD = 1 << 22
+
+def _make_row_serializer(running_status):
+    """
+    @brief  Build the row serializer for one running_status setting.
+    
+    @param  running_status (bool): Omit status bytes that repeat the previous one.
+    @return (function): serialize_rows(out, pos, prev_tick, prev_status,
+                        keys, messages, start, stop), see below.
+    
+    The flag is a closure constant, so when Numba compiles the serializer the
+    inner loop only carries the status branch the track needs.
+    """
+    def serialize_rows(out, pos, prev_tick, prev_status, keys, messages, start, stop):
+        """
+        @brief  Write sorted channel event rows [start, stop) into an output buffer.
+        
+        @param  out (bytearray): Preallocated output buffer.
+        @param  pos (int): Write offset into 'out'.
+        @param  prev_tick (int): Tick of the previously written event.
+        @param  prev_status (int): Status byte in effect for running status (0 = none).
+        @param  keys, messages (array('q')): The two halves of MidiWriter.Track.rows.
+        @param  start, stop (int): Range of rows to write.
+        @return (tuple): (new write offset, tick of the last written event,
+                          status byte in effect after the last event)
+        
+        A delta-time above 0x0FFFFFFF (the largest MIDI variable-length quantity)
+        stops it early with a write offset of -1 - i, where i is the offending row.
+        
+        Uses only integers and buffers so that it can be compiled by Numba. Each
+        row may touch up to 4 bytes past its delta-time, so 'out' must leave room
+        for 4 + 3 bytes per row.
+        """
+        for i in range(start, stop):
+            tick = keys[i] >> 1
+            delta = tick - prev_tick
+            if delta > 0x0FFFFFFF:
+                return -1 - i, prev_tick, prev_status
+            prev_tick = tick
+            # Shift the used bytes of the delta-time to the top and store all four,
+            # with no branch on its size. Bytes past n_bytes are overwritten by the
+            # event that follows.
+            packed, n_bytes = _pack_var_len(delta)
+            packed <<= 8 * (4 - n_bytes)
+            out[pos] = (packed >> 24) & 0xFF
+            out[pos + 1] = (packed >> 16) & 0xFF
+            out[pos + 2] = (packed >> 8) & 0xFF
+            out[pos + 3] = packed & 0xFF
+            pos += n_bytes
+            message = messages[i]
+            st = message >> 16
+            if st != prev_status or not running_status:
+                out[pos] = st
+                pos += 1
+                prev_status = st
+            out[pos] = (message >> 8) & 0xFF
+            if (st & 0xE0) == 0xC0:
+                # Program change / channel pressure carry a single data byte.
+                pos += 1
+            else:
+                out[pos + 1] = message & 0xFF
+                pos += 2
+        return pos, prev_tick, prev_status
+    return serialize_rows
+
+# Compiled row serializers by running_status, built on first use (None when
+# Numba is not installed).
+_row_serializers = {}
+
+def _get_row_serializer(running_status):
+    """
+    @brief  Return the Numba row serializer for one running_status setting.
+    
+    @param  running_status (bool): Omit status bytes that repeat the previous one.
+    @return (function): A compiled _make_row_serializer() variant, or None
+                        without Numba.
+    
+    Numba is optional and only imported here, on the first track of
+    _JIT_THRESHOLD events or more, so it is never needed to import this module.
+    The compiled code is cached on disk (cache=True), so later processes load it
+    instead of compiling again.
+    """
+    key = bool(running_status)
+    if key not in _row_serializers:
+        try:
+            import numba
+        except ImportError:
+            _row_serializers[key] = None
+        else:
+            from numba.extending import register_jitable
+            # Lets the compiled serializer call _pack_var_len(), inlined.
+            register_jitable(inline="always")(_pack_var_len)
+            _row_serializers[key] = numba.njit(cache=True)(_make_row_serializer(key))
+    return _row_serializers[key]
 
 class MidiWriter:
     """
@@ -24,6 +304,7 @@ class MidiWriter:
     
     @publicmethods:
     - addTrack() -> int
+    - reset()
     - setChannel(int channel = 0, int program = 0)
     - addBPM(int track = 0, int start = 0, int bpm = 120)
     - addNote(
@@ -34,21 +315,44 @@ class MidiWriter:
         int pitch = 60,
         int velocity = 120
       )
+    - addNotes(
+        list starts,
+        list durations,
+        list pitches = 60,
+        list velocities = 127,
+        int track = 0,
+        int channel = 0
+      )
+    - toBytes() -> bytearray
     - save(str output_filename)
+    - saveBatch(list files)
     """
     
+    # Validate start/duration/velocity ranges in addNotes(). Off under python -O,
+    # where batches are trusted to be in range.
+    CHECK_BOUNDS = __debug__
+    
     class Track:
         """
         @brief  Represents a single MIDI track.
         
-        The Track class stores a list of MIDI events. Each event is a tuple of
-        (tick, event_bytes), where 'tick' is the absolute tick time and 'event_bytes'
-        is the corresponding MIDI message.
+        Channel events (note on/off, program change) are stored in 'rows' as
+        (sort key, message) pairs: the key from _sort_key(), and the MIDI message
+        packed into one int as status << 16 | data1 << 8 | data2. That is one
+        tuple and two small ints per event (about 128 bytes), chosen over packed
+        columns because appending and sorting it stays in C.
+        
+        Meta events (tempo, time signature) have variable length and are kept
+        separately: a tick column, plus all event bytes back to back in one buffer,
+        where meta event j is meta_data[meta_offsets[j]:meta_offsets[j + 1]], so
+        no Python object is kept per meta event.
         """
         
         def __init__(self):
-            # Each event is a tuple: (tick, event_bytes)
-            self.events = []
+            self.rows = []
+            self.meta_ticks = array("q")
+            self.meta_offsets = array("q", [0])
+            self.meta_data = bytearray()
         
         def add_event(self, tick, event_bytes):
             """
@@ -57,16 +361,38 @@ class MidiWriter:
             @param  tick (int): The absolute tick time at which the event occurs.
             @param  event_bytes (bytes): The MIDI event message.
             """
-            self.events.append((tick, event_bytes))
+            if event_bytes[0] == 0xFF:
+                self.meta_ticks.append(tick)
+                self.meta_data += event_bytes
+                self.meta_offsets.append(len(self.meta_data))
+                return
+            # Pad 2-byte messages (program change) with a 0 data byte.
+            message = int.from_bytes(event_bytes[:3].ljust(3, b"\x00"), "big")
+            self.rows.append((_sort_key(tick, event_bytes[0]), message))
         
         def sort_events(self):
             """
             @brief  Sort events by their tick time.
             
+            At equal ticks, note off events come before all other channel events.
             This method must be called before writing the MIDI file to ensure that events
             are in chronological order.
             """
-            self.events.sort(key=lambda ev: ev[0])
+            # Stable, so events with equal keys keep their insertion order, and
+            # already-sorted rows take a single pass.
+            self.rows.sort(key=_row_key)
+            
+            meta_ticks, offsets, data = self.meta_ticks, self.meta_offsets, self.meta_data
+            order = sorted(range(len(meta_ticks)), key=meta_ticks.__getitem__)
+            sorted_data = bytearray()
+            sorted_offsets = array("q", [0])
+            for j in order:
+                sorted_data += data[offsets[j]:offsets[j + 1]]
+                sorted_offsets.append(len(sorted_data))
+            self.meta_ticks = array("q", map(meta_ticks.__getitem__, order))
+            self.meta_offsets = sorted_offsets
+            self.meta_data = sorted_data
+        
     
     def __init__(self):
         """
@@ -78,6 +404,7 @@ class MidiWriter:
         self.ticks_per_quarter = 480
         self.tracks = []           # List of Track objects.
         self.channel_program = {}  # Mapping: channel id -> program number.
+        self.running_status = True # Omit repeated status bytes when saving.
     
     def encode_var_len(self, value):
         """
@@ -89,6 +416,11 @@ class MidiWriter:
         The MIDI specification requires delta-times to be stored in a variable-length
         format. This function converts an integer into that format.
         """
+        if value <= 0x0FFFFFFF:
+            # The MIDI range (at most four 7-bit chunks) needs no loop.
+            packed, n_bytes = _pack_var_len(value)
+            return packed.to_bytes(n_bytes, "big")
+        
         buffer = value & 0x7F
         value >>= 7  # shift value right by 7 bits
         while value > 0:
@@ -115,6 +447,23 @@ class MidiWriter:
         self.tracks.append(track)
         return len(self.tracks) - 1
 
+    def reset(self):
+        """
+        @brief  Remove all tracks, events and channel programs to start a new file.
+        
+        The old tracks are dropped, not emptied in place: the event lists free
+        their storage when cleared anyway, and a new file may use fewer tracks.
+        
+        @usage
+            myMidi = MidiWriter()
+            for song in songs:
+                myMidi.reset()
+                ...  # add events for this song
+                myMidi.save(song.filename)
+        """
+        self.tracks = []
+        self.channel_program.clear()
+
     def _get_track(self, track_idx):
         """
         @brief  Retrieve a track by index, auto-adding tracks if necessary.
@@ -170,13 +519,8 @@ class MidiWriter:
             return
 
         tick = int(start) # start is already in ticks
-        # Calculate tempo in microseconds per quarter note (μs/qn).
-        # Formula: 60,000,000 / BPM.
-        tempo = int(60000000 / bpm)
-        # Convert tempo to a 3-byte big-endian value.
-        tempo_bytes = tempo.to_bytes(3, byteorder="big")
-        # Construct the tempo meta event: FF 51 03 <tempo_bytes>
-        meta_event = bytes([0xFF, 0x51, 0x03]) + tempo_bytes
+        # Tempo meta event in microseconds per quarter note (μs/qn).
+        meta_event = _tempo_meta(bpm)
         
         trk = self._get_track(track)
         trk.add_event(tick, meta_event)
@@ -218,18 +562,93 @@ class MidiWriter:
             ))
             return
         
-        start_tick = int(start)
-        end_tick = int(start + duration)
+        # Note on at start, note off at start + duration (velocity 0).
+        rows = self._get_track(track).rows
+        status = channel & 0x0F
+        pitch_bits = (pitch & 0x7F) << 8
+        rows.append((_sort_key(int(start), 0x90), (0x90 | status) << 16 | pitch_bits | (velocity & 0x7F)))
+        rows.append((_sort_key(int(start + duration), 0x80), (0x80 | status) << 16 | pitch_bits))
+    
+    def addNotes(self, starts, durations, pitches=60, velocities=127, track=0, channel=0):
+        """
+        @brief  Add a batch of MIDI notes to a track in a single call.
         
-        trk = self._get_track(track)
+        @param  starts (list)     : Start times in MIDI ticks.
+        @param  durations (list)  : Durations in MIDI ticks (> 0), or one number for all notes.
+        @param  pitches (list)    : MIDI note numbers (0 to 127), or one number for all notes.
+        @param  velocities (list) : Note velocities (0 to 127), or one number for all notes.
+        @param  track (int)       : Track index (>= 0).
+        @param  channel (int)     : MIDI channel (0 to 15).
         
-        # Note on event: status byte 0x90 + channel, note number, velocity.
-        note_on = bytes([0x90 | (channel & 0x0F), pitch & 0x7F, velocity & 0x7F])
-        trk.add_event(start_tick, note_on)
+        Equivalent to calling addNote() once per element, but builds all note on/off
+        events for the batch at once and appends them to the track in one shot.
+        The start/duration/velocity range checks run only while CHECK_BOUNDS is set
+        (the default, unless Python runs with -O).
         
-        # Note off event: status byte 0x80 + channel, note number, velocity 0.
-        note_off = bytes([0x80 | (channel & 0x0F), pitch & 0x7F, 0])
-        trk.add_event(end_tick, note_off)
+        @usage
+            # Four quarter notes:
+            TPQ = 480
+            myMidi.addNotes(
+                starts=[0 * TPQ, 1 * TPQ, 2 * TPQ, 3 * TPQ],
+                durations=TPQ,
+                pitches=[60, 62, 64, 65],
+                velocities=120
+            )
+        """
+        count = None
+        try:
+            count = len(starts)
+            durations = self._broadcast(durations, count)
+            pitches = self._broadcast(pitches, count)
+            velocities = self._broadcast(velocities, count)
+            if track < 0:
+                raise ValueError("[E] Track value '{}' cannot be negative. Expected integer >= 0.".format(track))
+            if channel < 0:
+                raise ValueError("[E] Channel value '{}' cannot be negative. Expected integer >= 0.".format(channel))
+            if not (len(durations) == len(pitches) == len(velocities) == count):
+                raise ValueError("[E] starts, durations, pitches and velocities must have the same length.")
+            if count == 0:
+                return
+            if self.CHECK_BOUNDS:
+                # One reduction per condition for the whole batch.
+                if min(starts) < 0:
+                    raise ValueError("[E] Start values cannot be negative. Expected integers >= 0.")
+                if min(durations) <= 0:
+                    raise ValueError("[E] Duration values must be > 0.")
+                if not (0 <= min(velocities) and max(velocities) <= 127):
+                    raise ValueError("[E] Velocity values must be in range [0, 127].")
+        except Exception as e:
+            print("[W] Could not add notes! Error: {}".format(e))
+            print("track={}, channel={}, count={}".format(track, channel, count))
+            return
+        
+        trk = self._get_track(track)
+        self._emit_notes(trk, channel, starts, durations, pitches, velocities)
+    
+    @staticmethod
+    def _broadcast(values, count):
+        """
+        @brief  Expand a scalar to a list of 'count' copies; pass sequences through.
+        """
+        if hasattr(values, "__len__"):
+            return values
+        return [values] * count
+    
+    @staticmethod
+    def _emit_notes(trk, channel, starts, durations, pitches, velocities):
+        """
+        @brief  Append note on/off rows for a batch of (already validated) notes.
+        """
+        on_status = 0x90 | (channel & 0x0F)
+        off_status = 0x80 | (channel & 0x0F)
+        # Note on at start, note off at start + duration (velocity 0).
+        on_keys = map(_sort_key, map(int, starts), repeat(on_status))
+        off_keys = map(_sort_key, map(int, map(operator.add, starts, durations)), repeat(off_status))
+        pitch_bits = [(p & 0x7F) << 8 for p in pitches]
+        on_messages = [on_status << 16 | p | (v & 0x7F) for p, v in zip(pitch_bits, velocities)]
+        off_messages = [off_status << 16 | p for p in pitch_bits]
+        trk.rows += zip(on_keys, on_messages)
+        trk.rows += zip(off_keys, off_messages)
    
     def addTimeSignature(self, track=0, start=0, numerator=4, denominator=4):
         """
@@ -268,14 +687,129 @@ class MidiWriter:
         trk = self._get_track(track)
         trk.add_event(start, event_bytes)
 
-    def save(self, output_filename="output.mid"):
+    def _serialize_track(self, trk):
         """
-        @brief  Write the MIDI file to disk.
+        @brief  Build the body of a track chunk from the track's event rows.
         
-        @param  output_filename (str): The name of the output file (e.g., "output.mid").
+        @param  trk (Track): A track whose events have already been sorted.
+        @return (bytearray): Delta-times and events, followed by end-of-track.
         
-        This method builds the MIDI header and all track chunks, then writes the
-        complete MIDI file to disk.
+        The sorted rows are written in runs by _write_rows(), or for tracks of
+        _JIT_THRESHOLD events or more by a Numba row serializer when Numba is
+        installed (see _serialize_track_jit()); meta events are written between
+        those runs, ahead of channel events that share the same tick. With
+        running_status enabled, a status byte equal to the previous one is omitted
+        (meta events cancel running status, as the MIDI file spec requires).
+        """
+        rows = trk.rows
+        if len(rows) >= _JIT_THRESHOLD:
+            out = self._serialize_track_jit(trk)
+            if out is not None:
+                return out
+        running_status = self.running_status
+        meta_ticks, meta_offsets, meta_data = trk.meta_ticks, trk.meta_offsets, trk.meta_data
+        meta_view = memoryview(meta_data)
+        
+        out = bytearray()
+        prev_tick = 0
+        prev_status = 0
+        row = 0
+        for j, tick in enumerate(meta_ticks):
+            # First row at or after this tick: (key,) sorts ahead of (key, message).
+            stop = bisect_left(rows, (tick << 1,), row)
+            if stop > row:
+                prev_tick, _ = _write_rows(out, rows[row:stop], prev_tick, prev_status, running_status)
+                row = stop
+            # Meta events cancel running status.
+            prev_status = 0
+            if tick - prev_tick > 0x0FFFFFFF:
+                self._raise_delta_error(tick - prev_tick)
+            out += self.encode_var_len(tick - prev_tick)
+            prev_tick = tick
+            # Copy the event bytes straight from the meta buffer.
+            out += meta_view[meta_offsets[j]:meta_offsets[j + 1]]
+        _write_rows(out, rows[row:] if row else rows, prev_tick, prev_status, running_status)
+        
+        # Append the end-of-track meta event (delta 0, then 0xFF 0x2F 0x00).
+        out += b"\x00\xFF\x2F\x00"
+        return out
+    
+    def _serialize_track_jit(self, trk):
+        """
+        @brief  Build the body of a track chunk with a Numba row serializer.
+        
+        @param  trk (Track): A track whose events have already been sorted.
+        @return (bytearray): Same as _serialize_track(), or None without Numba.
+        
+        The rows are unpacked once into key/message columns, which are written
+        into one preallocated buffer (see _get_row_serializer()).
+        """
+        serialize_rows = _get_row_serializer(self.running_status)
+        if serialize_rows is None:
+            return None
+        rows = trk.rows
+        n = len(rows)
+        # list() first: building an array from a list is much faster than from
+        # an iterator.
+        keys = array("q", list(map(_row_key, rows)))
+        messages = array("q", list(map(_row_message, rows)))
+        meta_ticks, meta_offsets, meta_data = trk.meta_ticks, trk.meta_offsets, trk.meta_data
+        meta_view = memoryview(meta_data)
+        
+        # Upper bound: every delta-time is taken as 4 bytes (the most a valid one
+        # needs) and every channel event as 3 bytes, plus end-of-track.
+        size = 7 * n + 4 * len(meta_ticks) + len(meta_data) + 4
+        out = bytearray(size)
+        pos = 0
+        prev_tick = 0
+        prev_status = 0
+        row = 0
+        for j, tick in enumerate(meta_ticks):
+            stop = bisect_left(keys, tick << 1, row, n)
+            pos, prev_tick, _ = serialize_rows(
+                out, pos, prev_tick, prev_status, keys, messages, row, stop
+            )
+            if pos < 0:
+                self._raise_delta_error((keys[-1 - pos] >> 1) - prev_tick)
+            # Meta events cancel running status.
+            prev_status = 0
+            row = stop
+            if tick - prev_tick > 0x0FFFFFFF:
+                self._raise_delta_error(tick - prev_tick)
+            delta = self.encode_var_len(tick - prev_tick)
+            prev_tick = tick
+            out[pos:pos + len(delta)] = delta
+            pos += len(delta)
+            # Copy the event bytes straight from the meta buffer.
+            lo, hi = meta_offsets[j], meta_offsets[j + 1]
+            out[pos:pos + hi - lo] = meta_view[lo:hi]
+            pos += hi - lo
+        pos, prev_tick, _ = serialize_rows(
+            out, pos, prev_tick, prev_status, keys, messages, row, n
+        )
+        if pos < 0:
+            self._raise_delta_error((keys[-1 - pos] >> 1) - prev_tick)
+        
+        # Append the end-of-track meta event (delta 0, then 0xFF 0x2F 0x00).
+        out[pos:pos + 4] = b"\x00\xFF\x2F\x00"
+        pos += 4
+        del out[pos:]
+        return out
+    
+    @staticmethod
+    def _raise_delta_error(delta):
+        """
+        @brief  Reject a delta-time that has no MIDI encoding.
+        """
+        # MIDI delta-times are at most four bytes (0x0FFFFFFF).
+        raise ValueError("[E] Delta-time '{}' exceeds the largest MIDI delta-time (0x0FFFFFFF).".format(delta))
+    
+    def _build_chunks(self):
+        """
+        @brief  Build the MIDI header and every track chunk as separate buffers.
+        
+        @return (list): Header chunk, then for each track its 8-byte chunk header
+                        followed by its body.
         """
         # Sort events in each track by tick before writing.
         for trk in self.tracks:
@@ -288,32 +822,70 @@ class MidiWriter:
         # MIDI format: use 1 if more than one track, else 0.
         midi_format = 1 if num_tracks > 1 else 0
         # The time division is the number of ticks per quarter note.
-        header_data = struct.pack(">hhh", midi_format, num_tracks, self.ticks_per_quarter)
-        header_chunk = header_chunk_type + struct.pack(">I", header_length) + header_data
+        header_data = _HEADER_DATA.pack(midi_format, num_tracks, self.ticks_per_quarter)
+        chunks = [header_chunk_type + _U32BE.pack(header_length) + header_data]
         
-        # Build track chunks.
-        track_chunks = b""
         for trk in self.tracks:
-            track_data = bytearray()
-            prev_tick = 0
-            for tick, event in trk.events:
-                delta_ticks = tick - prev_tick
-                prev_tick = tick
-                track_data += self.encode_var_len(delta_ticks)
-                track_data += event
-            
-            # Append the end-of-track meta event (0xFF 0x2F 0x00)
-            track_data += self.encode_var_len(0)
-            track_data += bytes([0xFF, 0x2F, 0x00])
+            track_data = self._serialize_track(trk)
             
             # Prepend the track header.
-            track_chunk = b"MTrk" + struct.pack(">I", len(track_data)) + track_data
-            track_chunks += track_chunk
+            chunks.append(b"MTrk" + _U32BE.pack(len(track_data)))
+            chunks.append(track_data)
+        return chunks
+    
+    def toBytes(self):
+        """
+        @brief  Build the complete MIDI file in memory.
+        
+        @return (bytearray): The MIDI header and all track chunks.
+        """
+        # Build the whole file in one buffer.
+        out = bytearray()
+        for chunk in self._build_chunks():
+            out += chunk
+        return out
+    
+    def save(self, output_filename="output.mid"):
+        """
+        @brief  Write the MIDI file to disk.
+        
+        @param  output_filename (str): The name of the output file (e.g., "output.mid").
+        
+        This method builds the MIDI header and all track chunks, then writes the
+        complete MIDI file to disk. Large files are written straight from the
+        per-track buffers into a memory-mapped file, without first assembling
+        the whole file in memory.
+        """
+        chunks = self._build_chunks()
+        total = sum(len(chunk) for chunk in chunks)
+        if total < _MMAP_THRESHOLD:
+            _write_file(output_filename, b"".join(chunks))
+        else:
+            _write_chunks_mmap(output_filename, chunks, total)
+    
+    @staticmethod
+    def saveBatch(files):
+        """
+        @brief  Write several MIDI files to disk at once.
+        
+        @param  files (list): (output_filename, data) pairs, where data is the
+                              result of toBytes().
         
-        # Write the complete MIDI file.
-        full_data = header_chunk + track_chunks
-        with open(output_filename, "wb") as f:
-            f.write(full_data)
+        With at least 4 files, the writes are issued concurrently from a shared
+        thread pool, so the kernel can service them in parallel instead of one file
+        after another. Smaller batches are written sequentially, the same way as
+        save().
+        
+        @usage
+            files = [("a.mid", midiA.toBytes()), ("b.mid", midiB.toBytes())]
+            MidiWriter.saveBatch(files)
+        """
+        if len(files) < _BATCH_THRESHOLD:
+            for output_filename, data in files:
+                _write_file(output_filename, data)
+            return
+        # list() re-raises the first error from any write.
+        list(_get_write_pool().map(lambda pair: _write_file(*pair), files))
 
 ################################################################################
 # Test functions and main() for demonstration purposes.
@@ -1,16 +1,234 @@
 #!/usr/bin/python3
 
+import sys
+from array import array
+from itertools import repeat
+from types import MappingProxyType
+
+__all__ = (
+    "NAME_TO_NUMBER", "NUMBER_TO_NAME", "NAME_TO_ID", "PROGRAM_LUT",
+    "NAME_TO_NUMBER_NORMALIZED", "ProgramMapping"
+)
+
+# Dense GM table: each value is also the name's position (0 to 127). The
+# values are CPython's cached small ints, so the dict holds no int objects
+# of its own.
+NAME_TO_NUMBER = MappingProxyType({sys.intern(k): v for k, v in {
+    # Category: Piano
+    "acoustic_grand_piano"    : 0, 
+    "bright_acoustic_piano"   : 1, 
+    "electric_grand_piano"    : 2, 
+    "honky-tonk_piano"        : 3, 
+    "rhodes_piano"            : 4, 
+    "chorused_piano"          : 5, 
+    "harpsichord"             : 6, 
+    "clavinet"                : 7, 
+
+    # Category: Chromatic Percussion
+    "celesta"                 : 8, 
+    "glockenspiel"            : 9, 
+    "music_box"               : 10, 
+    "vibraphone"              : 11, 
+    "marimba"                 : 12, 
+    "xylophone"               : 13, 
+    "tubular_bells"           : 14, 
+    "dulcimer"                : 15,
+
+    # Category: Organ
+    "hammond_organ"           : 16, 
+    "percussive_organ"        : 17, 
+    "rock_organ"              : 18, 
+    "church_organ"            : 19, 
+    "reed_organ"              : 20, 
+    "accordion"               : 21, 
+    "harmonica"               : 22, 
+    "tango_accordion"         : 23,
+
+    # Category: Guitar
+    "acoustic_guitar_(nylon)" : 24, 
+    "acoustic_guitar_(steel)" : 25, 
+    "electric_guitar_(jazz)"  : 26, 
+    "electric_guitar_(clean)" : 27, 
+    "electric_guitar_(muted)" : 28, 
+    "overdriven_guitar"       : 29, 
+    "distortion_guitar"       : 30, 
+    "guitar_harmonics"        : 31,
+
+    # Category: Bass
+    "acoustic_bass"           : 32, 
+    "electric_bass_(finger)"  : 33, 
+    "electric_bass_(pick)"    : 34, 
+    "fretless_bass"           : 35, 
+    "slap_bass_1"             : 36, 
+    "slap_bass_2"             : 37, 
+    "synth_bass_1"            : 38, 
+    "synth_bass_2"            : 39,
+
+    # Category: String
+    "violin"                  : 40, 
+    "viola"                   : 41, 
+    "cello"                   : 42, 
+    "contrabass"              : 43, 
+    "tremolo_strings"         : 44, 
+    "pizzicato_strings"       : 45, 
+    "orchestral_harp"         : 46, 
+    "timpani"                 : 47,
+
+    # Category: Ensemble
+    "string_ensemble_1"       : 48, 
+    "string_ensemble_2"       : 49, 
+    "synth_strings_1"         : 50, 
+    "synth_strings_2"         : 51, 
+    "choir_aahs"              : 52, 
+    "voice_oohs"              : 53, 
+    "synth_voice"             : 54, 
+    "orchestra_hit"           : 55,
+
+    # Category: Brass
+    "trumpet"                 : 56, 
+    "trombone"                : 57, 
+    "tuba"                    : 58, 
+    "muted_trumpet"           : 59, 
+    "french_horn"             : 60, 
+    "brass_section"           : 61, 
+    "synth_brass_1"           : 62, 
+    "synth_brass_2"           : 63,
+
+    # Category: Reed
+    "soprano_sax"             : 64, 
+    "alto_sax"                : 65, 
+    "tenor_sax"               : 66, 
+    "baritone_sax"            : 67, 
+    "oboe"                    : 68, 
+    "english_horn"            : 69, 
+    "bassoon"                 : 70, 
+    "clarinet"                : 71,
+
+    # Category: Woodwind
+    "piccolo"                 : 72, 
+    "flute"                   : 73, 
+    "recorder"                : 74, 
+    "pan_flute"               : 75, 
+    "bottle_blow"             : 76, 
+    "shakuhachi"              : 77, 
+    "whistle"                 : 78, 
+    "ocarina"                 : 79,
+
+    # Category: Synth Lead
+    "lead_1_(square)"         : 80,
+    "lead_2_(sawtooth)"       : 81,
+    "lead_3_(calliope_lead)"  : 82,
+    "lead_4_(chiffer_lead)"   : 83,
+    "lead_5_(charang)"        : 84,
+    "lead_6_(voice)"          : 85,
+    "lead_7_(fifths)"         : 86,
+    "lead_8_(brass_+_lead)"   : 87,
+
+    # Category: Synth Pad
+    "pad_1_(new_age)"         : 88, 
+    "pad_2_(warm)"            : 89, 
+    "pad_3_(polysynth)"       : 90, 
+    "pad_4_(choir)"           : 91, 
+    "pad_5_(bowed)"           : 92, 
+    "pad_6_(metallic)"        : 93, 
+    "pad_7_(halo)"            : 94, 
+    "pad_8_(sweep)"           : 95,
+
+    # Category: Synth Effect
+    "fx_1_(rain)"             : 96, 
+    "fx_2_(soundtrack)"       : 97, 
+    "fx_3_(crystal)"          : 98, 
+    "fx_4_(atmosphere)"       : 99, 
+    "fx_5_(brightness)"       : 100, 
+    "fx_6_(goblins)"          : 101, 
+    "fx_7_(echoes)"           : 102, 
+    "fx_8_(sci-fi)"           : 103,
+
+    # Category: Ethnic
+    "sitar"                   : 104, 
+    "banjo"                   : 105, 
+    "shamisen"                : 106, 
+    "koto"                    : 107, 
+    "kalimba"                 : 108, 
+    "bagpipe"                 : 109, 
+    "fiddle"                  : 110, 
+    "shana"                   : 111,
+
+    # Category: Aux Percussion
+    "tinkle_bell"             : 112, 
+    "agogo"                   : 113, 
+    "steel_drums"             : 114, 
+    "woodblock"               : 115, 
+    "taiko_drum"              : 116, 
+    "melodic_tom"             : 117, 
+    "synth_drum"              : 118, 
+    "cymbal_reverse"          : 119,
+
+    # Category: SFX
+    "guitar_fret_noise"       : 120, 
+    "breath_noise"            : 121, 
+    "seashore"                : 122, 
+    "bird_tweet"              : 123, 
+    "telephone_ring"          : 124, 
+    "helicopter"              : 125, 
+    "applause"                : 126, 
+    "gunshot"                 : 127, 
+}.items()})
+
+# Reverse table: NUMBER_TO_NAME[program] is the instrument name.
+NUMBER_TO_NAME = tuple(sorted(NAME_TO_NUMBER, key=NAME_TO_NUMBER.__getitem__))
+
+# Integer-only form of NAME_TO_NUMBER for jitted code: NAME_TO_ID gives each
+# name a dense id (its position), and PROGRAM_LUT[id] is its program number.
+NAME_TO_ID = MappingProxyType({name: i for i, name in enumerate(NAME_TO_NUMBER)})
+PROGRAM_LUT = array("B", NAME_TO_NUMBER.values())
+
+# Common spellings of every name, precomputed so lookup() never has to
+# normalize its argument: "rock_organ", "rock organ", "Rock_Organ",
+# "Rock Organ", "ROCK_ORGAN" and "ROCK ORGAN" all map to 18.
+NAME_TO_NUMBER_NORMALIZED = MappingProxyType({
+    sys.intern(variant): number
+    for name, number in NAME_TO_NUMBER.items()
+    for spelling in (name, name.replace("_", " "))
+    for variant in (spelling, spelling.title(), spelling.upper())
+})
+
 class ProgramMapping:
     """ 
     @brief     Helpful encapsulated mappings for program to instrument.
     @detail    While using MidiWriter.setChannel(int channel, int program)
+               uses the module-level NAME_TO_NUMBER (read-only mapping), also
+               available as the class variable ProgramMapping.NAME_TO_NUMBER
     
     @usage
     ```
     from midi_writer import MidiWriter
-    myMidi = MidiWriter(
-    inst_id = ProgramMapping.NAME_TO_NUMBER.get("rock_organ", 0) # should return 18 from "rock_organ"
-    myMidi.setChannel(channel=0, inst_id)
+    from program_mapping import NAME_TO_NUMBER, ProgramMapping
+    myMidi = MidiWriter()
+    inst_id = NAME_TO_NUMBER.get("rock_organ", 0) # should return 18 from "rock_organ"
+    inst_id = ProgramMapping.lookup("rock_organ", 0) # same, as a method
+    inst_id = ProgramMapping.lookup("Rock Organ", 0) # common spellings also return 18
+    inst_ids = ProgramMapping.lookup_many(["rock_organ", "violin"]) # [18, 40]
+    name = ProgramMapping.name_of(18) # "rock_organ"
+    myMidi.setChannel(channel=0, program=inst_id)
+    ```
+
+    The keys of NAME_TO_NUMBER are interned with sys.intern(), so a lookup with
+    the same string object matches on identity without comparing characters.
+    Identifier-like literals ("rock_organ") are interned by CPython already;
+    pass sys.intern(name) for names read from files, or containing characters
+    such as "-" or "(".
+
+    Numba's nopython mode cannot read a Python dict. To look up programs inside
+    a jitted loop, translate names to ids once outside it and index PROGRAM_LUT
+    (an array("B"), which Numba reads through the buffer protocol):
+    ```
+    ids = array("q", [NAME_TO_ID[n] for n in names])
+
+    @numba.njit(cache=True)
+    def programs(lut, ids, out):
+        for i in range(len(ids)):
+            out[i] = lut[ids[i]]
     ```
     """
     
@@ -28,177 +246,70 @@ class ProgramMapping:
         clavinet                = 7, 
     '''
 
-    NAME_TO_NUMBER = {
-        # Category: Piano
-        "acoustic_grand_piano"    : 0, 
-        "bright_acoustic_piano"   : 1, 
-        "electric_grand_piano"    : 2, 
-        "honky-tonk_piano"        : 3, 
-        "rhodes_piano"            : 4, 
-        "chorused_piano"          : 5, 
-        "harpsichord"             : 6, 
-        "clavinet"                : 7, 
-
-        # Category: Chromatic Percussion
-        "celesta"                 : 8, 
-        "glockenspiel"            : 9, 
-        "music_box"               : 10, 
-        "vibraphone"              : 11, 
-        "marimba"                 : 12, 
-        "xylophone"               : 13, 
-        "tubular_bells"           : 14, 
-        "dulcimer"                : 15,
-
-        # Category: Organ
-        "hammond_organ"           : 16, 
-        "percussive_organ"        : 17, 
-        "rock_organ"              : 18, 
-        "church_organ"            : 19, 
-        "reed_organ"              : 20, 
-        "accordion"               : 21, 
-        "harmonica"               : 22, 
-        "tango_accordion"         : 23,
-
-        # Category: Guitar
-        "acoustic_guitar_(nylon)" : 24, 
-        "acoustic_guitar_(steel)" : 25, 
-        "electric_guitar_(jazz)"  : 26, 
-        "electric_guitar_(clean)" : 27, 
-        "electric_guitar_(muted)" : 28, 
-        "overdriven_guitar"       : 29, 
-        "distortion_guitar"       : 30, 
-        "guitar_harmonics"        : 31,
-
-        # Category: Bass
-        "acoustic_bass"           : 32, 
-        "electric_bass_(finger)"  : 33, 
-        "electric_bass_(pick)"    : 34, 
-        "fretless_bass"           : 35, 
-        "slap_bass_1"             : 36, 
-        "slap_bass_2"             : 37, 
-        "synth_bass_1"            : 38, 
-        "synth_bass_2"            : 39,
-
-        # Category: String
-        "violin"                  : 40, 
-        "viola"                   : 41, 
-        "cello"                   : 42, 
-        "contrabass"              : 43, 
-        "tremolo_strings"         : 44, 
-        "pizzicato_strings"       : 45, 
-        "orchestral_harp"         : 46, 
-        "timpani"                 : 47,
-
-        # Category: Ensemble
-        "string_ensemble_1"       : 48, 
-        "string_ensemble_2"       : 49, 
-        "synth_strings_1"         : 50, 
-        "synth_strings_2"         : 51, 
-        "choir_aahs"              : 52, 
-        "voice_oohs"              : 53, 
-        "synth_voice"             : 54, 
-        "orchestra_hit"           : 55,
-
-        # Category: Brass
-        "trumpet"                 : 56, 
-        "trombone"                : 57, 
-        "tuba"                    : 58, 
-        "muted_trumpet"           : 59, 
-        "french_horn"             : 60, 
-        "brass_section"           : 61, 
-        "synth_brass_1"           : 62, 
-        "synth_brass_2"           : 63,
-
-        # Category: Reed
-        "soprano_sax"             : 64, 
-        "alto_sax"                : 65, 
-        "tenor_sax"               : 66, 
-        "baritone_sax"            : 67, 
-        "oboe"                    : 68, 
-        "english_horn"            : 69, 
-        "bassoon"                 : 70, 
-        "clarinet"                : 71,
-
-        # Category: Woodwind
-        "piccolo"                 : 72, 
-        "flute"                   : 73, 
-        "recorder"                : 74, 
-        "pan_flute"               : 75, 
-        "bottle_blow"             : 76, 
-        "shakuhachi"              : 77, 
-        "whistle"                 : 78, 
-        "ocarina"                 : 79,
-
-        # Category: Synth Lead
-        "lead_1_(square)"         : 80,
-        "lead_2_(sawtooth)"       : 81,
-        "lead_3_(calliope_lead)"  : 82,
-        "lead_4_(chiffer_lead)"   : 83,
-        "lead_5_(charang)"        : 84,
-        "lead_6_(voice)"          : 85,
-        "lead_7_(fifths)"         : 86,
-        "lead_8_(brass_+_lead)"   : 87,
-
-        # Category: Synth Pad
-        "pad_1_(new_age)"         : 88, 
-        "pad_2_(warm)"            : 89, 
-        "pad_3_(polysynth)"       : 90, 
-        "pad_4_(choir)"           : 91, 
-        "pad_5_(bowed)"           : 92, 
-        "pad_6_(metallic)"        : 93, 
-        "pad_7_(halo)"            : 94, 
-        "pad_8_(sweep)"           : 95,
-
-        # Category: Synth Effect
-        "fx_1_(rain)"             : 96, 
-        "fx_2_(soundtrack)"       : 97, 
-        "fx_3_(crystal)"          : 98, 
-        "fx_4_(atmosphere)"       : 99, 
-        "fx_5_(brightness)"       : 100, 
-        "fx_6_(goblins)"          : 101, 
-        "fx_7_(echoes)"           : 102, 
-        "fx_8_(sci-fi)"           : 103,
-
-        # Category: Ethnic
-        "sitar"                   : 104, 
-        "banjo"                   : 105, 
-        "shamisen"                : 106, 
-        "koto"                    : 107, 
-        "kalimba"                 : 108, 
-        "bagpipe"                 : 109, 
-        "fiddle"                  : 110, 
-        "shana"                   : 111,
-
-        # Category: Aux Percussion
-        "tinkle_bell"             : 112, 
-        "agogo"                   : 113, 
-        "steel_drums"             : 114, 
-        "woodblock"               : 115, 
-        "taiko_drum"              : 116, 
-        "melodic_tom"             : 117, 
-        "synth_drum"              : 118, 
-        "cymbal_reverse"          : 119,
-
-        # Category: SFX
-        "guitar_fret_noise"       : 120, 
-        "breath_noise"            : 121, 
-        "seashore"                : 122, 
-        "bird_tweet"              : 123, 
-        "telephone_ring"          : 124, 
-        "helicopter"              : 125, 
-        "applause"                : 126, 
-        "gunshot"                 : 127, 
-    }
+    # Module-level tables, re-exported for ProgramMapping.NAME_TO_NUMBER users.
+    NAME_TO_NUMBER = NAME_TO_NUMBER
+    NUMBER_TO_NAME = NUMBER_TO_NAME
+    NAME_TO_ID = NAME_TO_ID
+    PROGRAM_LUT = PROGRAM_LUT
+    NAME_TO_NUMBER_NORMALIZED = NAME_TO_NUMBER_NORMALIZED
 
+    @classmethod
+    def lookup(cls, name, default=None):
+        """
+        @brief  Look up a program number by instrument name.
+        
+        @param  name (str): Instrument name, e.g. "rock_organ" or "Rock Organ".
+        @param  default: Returned when the name is unknown.
+        @return (int): The program number (0 to 127), or default.
+        
+        Every spelling, the exact name included, is a key of
+        NAME_TO_NUMBER_NORMALIZED, so this is a single get(). A miss costs the
+        same one probe, with no first-character pre-check in front of it, and
+        any other key (e.g. None) simply returns default.
+        
+        A generated (gperf-style) perfect hash over the names is deliberately not
+        used: computing it in Python costs about 1 us per lookup, against about
+        30 ns for NAME_TO_NUMBER.get(), whose probe reuses the hash that every
+        str caches after its first use. A binary search over the sorted names is
+        not used either: bisect_left compares whole strings at every step, and
+        measures slower than the one hashed probe.
+        """
+        return NAME_TO_NUMBER_NORMALIZED.get(name, default)
 
-if __name__ == "__main__":
-    PM = ProgramMapping()
-    print("PROGRAM MAPPING: NAME TO NUMBER")
-    print("*" * 80)
-    for k,v in PM.NAME_TO_NUMBER.items():
-        print("{}: {}".format(
-            f"\"{k}\"".ljust(30),
-            str(v)
-        ))
-    print("*" * 80)
+    @classmethod
+    def lookup_many(cls, names, default=None):
+        """
+        @brief  Look up the program numbers of many instrument names at once.
+        
+        @param  names (iterable of str): Instrument names, in any spelling lookup() accepts.
+        @param  default: Used for each unknown name.
+        @return (list of int): The program numbers, in the order of names.
+        
+        Runs as a single C-level map over NAME_TO_NUMBER_NORMALIZED.get(). The
+        names are not interned here: a str caches its hash after the first
+        lookup, and interning costs a dict probe of its own. Intern names that
+        are kept and looked up repeatedly, e.g. ones read once from a file.
+        """
+        return list(map(NAME_TO_NUMBER_NORMALIZED.get, names, repeat(default)))
 
+    @classmethod
+    def name_of(cls, prog):
+        """
+        @brief  Look up an instrument name by program number.
+        
+        @param  prog (int): Program number (0 to 127).
+        @return (str): The instrument name, e.g. "rock_organ" for 18.
+        @raise  IndexError: If prog is outside 0 to 127.
+        """
+        # Checked explicitly: a negative index would wrap around the tuple.
+        if not 0 <= prog <= 127:
+            raise IndexError("[E] Program number '{}' must be in range [0, 127].".format(prog))
+        return NUMBER_TO_NAME[prog]
+
+
+if __name__ == "__main__":
+    lines = ["PROGRAM MAPPING: NAME TO NUMBER", "*" * 80]
+    lines += [f'"{k}"'.ljust(30) + f": {v}" for k, v in NAME_TO_NUMBER.items()]
+    lines.append("*" * 80)
+    sys.stdout.write("\n".join(lines))
+    sys.stdout.write("\n")